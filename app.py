@@ -1,11 +1,11 @@
-import time
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import streamlit as st
-import yfinance as yf
 import plotly.graph_objects as go
 
-from utils import black_scholes, calc_hist_vol, get_risk_free_rate, bs_delta
+from utils import black_scholes_pair, calc_hist_vol, get_risk_free_rate, bs_delta, get_history_1y, get_last_price
 
 logging.basicConfig(level=logging.INFO)
 
@@ -20,10 +20,20 @@ st.set_page_config(
 
 
 
+# Static HTML/CSS snippets
+PROFILE_URL = 'https://www.linkedin.com/in/zian-zayn-chen'
+ICON_URL = 'https://cdn-icons-png.flaticon.com/512/174/174857.png'
+PROFILE_LINK_HTML = f'<a href="{PROFILE_URL}" target="_blank" style="text-decoration: none; color: inherit;"><img src="{ICON_URL}" width="16" height="16" style="vertical-align: middle; margin-right: 10px;">`Zian (Zayn) Chen`</a>'
+CALL_CELL_CSS = 'background-color: rgba(200, 230, 201, 0.3)'
+PUT_CELL_CSS = 'background-color: rgba(255, 204, 204, 0.3)'
+
+# Volatility selectbox options; defined up here because the real-data prefetch reads the selection
+VOL_TYPES = ['Hist 6mo', 'Hist 3mo', 'Hist 1mo']
+
+
+
 #  Zian Chen LinkedIn link
-profile_url = 'https://www.linkedin.com/in/zian-zayn-chen'
-icon_url = 'https://cdn-icons-png.flaticon.com/512/174/174857.png'
-st.sidebar.markdown(f'<a href="{profile_url}" target="_blank" style="text-decoration: none; color: inherit;"><img src="{icon_url}" width="16" height="16" style="vertical-align: middle; margin-right: 10px;">`Zian (Zayn) Chen`</a>', unsafe_allow_html=True)
+st.sidebar.markdown(PROFILE_LINK_HTML, unsafe_allow_html=True)
 
 
 
@@ -34,27 +44,39 @@ use_real_data = st.sidebar.checkbox('Use real data (Yahoo Finance)', value=True)
 
 ticker = st.sidebar.text_input('Ticker', value='NVDA', disabled=False if use_real_data else True)
 
+vol_future = None
+
 if use_real_data:
     if ticker:
         try:
             with st.spinner(f'Fetching data for {ticker} from Yahoo Finance...'):
-                stock = yf.Ticker(ticker)
-                time.sleep(0.5)  # Avoid rate limiting
-                stock_info = stock.info
+                # Fire the independent Yahoo requests together so wall time is the slowest one,
+                # not the sum. The vol period widget is created further down, so read its last
+                # value from session state. The 1Y history call only warms the chart cache.
+                period = st.session_state.get('vol_type', VOL_TYPES[0]).split()[-1]
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    price_future = executor.submit(get_last_price, ticker)
+                    rfr_future = executor.submit(get_risk_free_rate)
+                    vol_future = executor.submit(calc_hist_vol, ticker, period)
+                    executor.submit(get_history_1y, ticker)
+
+                last_px = price_future.result()
                 
-                if 'currentPrice' not in stock_info or stock_info['currentPrice'] is None:
+                if last_px is None:
                     st.error(f"Unable to fetch current price for {ticker}. Possible reasons:\n- Yahoo Finance rate limiting\n- Invalid ticker symbol\n\nPlease try again later or use manual price input.")
                     use_real_data = False
                     last_px = 100
                 else:
-                    last_px = stock_info['currentPrice']
                     st.success(f"✓ Successfully fetched data for {ticker}")
             
             # Fetch risk-free rate (with caching and error handling)
             try:
-                risk_free_rate = get_risk_free_rate()
+                risk_free_rate = rfr_future.result()
             except Exception as e:
                 logging.warning(f"Failed to fetch risk-free rate, using default value: {str(e)[:100]}")
+                risk_free_rate = None
+            if risk_free_rate is None:
+                st.warning("Unable to fetch risk-free rate (^IRX)\n\nUsing default value 2%")
                 risk_free_rate = 0.02
         except Exception as e:
             st.error(f"Failed to fetch data for {ticker}\n\nError: {str(e)[:150]}\n\nPlease check the ticker symbol or try again later")
@@ -92,7 +114,7 @@ rfr = st.sidebar.number_input('Risk free rate', value=risk_free_rate if use_real
 # Volatility
 v_col1, v_col2 = st.sidebar.columns([2,3])
 with v_col1:
-    vol_type = st.selectbox('Vol Type', ['Hist 6mo', 'Hist 3mo', 'Hist 1mo'], disabled=False if use_real_data else True)
+    vol_type = st.selectbox('Vol Type', VOL_TYPES, key='vol_type', disabled=False if use_real_data else True)
     period = vol_type.split()[-1]
 
 vol_value = 0.2  # Default volatility
@@ -100,7 +122,7 @@ vol_value = 0.2  # Default volatility
 if use_real_data and ticker:
     try:
         with st.spinner(f'Calculating historical volatility for {ticker}...'):
-            vol_value = calc_hist_vol(ticker, period)
+            vol_value = vol_future.result() if vol_future is not None else calc_hist_vol(ticker, period)
             st.success(f"✓ Successfully calculated volatility: {vol_value:.2%}")
     except ValueError as ve:
         st.warning(f"Unable to calculate volatility: {str(ve)}\n\nUsing default value 20%")
@@ -128,21 +150,7 @@ if not use_real_data:
 
 # Main Page
 
-call_px = black_scholes(
-    S=spot_px,
-    K=strike_px,
-    T=t,
-    sigma=vol_value,
-    r=rfr,
-    option_type='call')
-
-put_px = black_scholes(
-    S=spot_px,
-    K=strike_px,
-    T=t,
-    sigma=vol_value,
-    r=rfr,
-    option_type='put')
+call_px, put_px = black_scholes_pair(spot_px, strike_px, t, rfr, vol_value)
 
 # Greeks: Delta
 call_delta = bs_delta(spot_px, strike_px, t, rfr, vol_value, option_type='call')
@@ -161,39 +169,37 @@ df = pd.DataFrame(pricing_data)
 
 # Apply column colors: light green for CALL, light red for PUT
 styled_df = (df.style
-    .map(lambda v: 'background-color: rgba(200, 230, 201, 0.3)', 
-         subset=['CALL'])
-    .map(lambda v: 'background-color: rgba(255, 204, 204, 0.3)', 
-         subset=['PUT']))
+    .map(lambda v: CALL_CELL_CSS, subset=['CALL'])
+    .map(lambda v: PUT_CELL_CSS, subset=['PUT']))
 
 st.dataframe(styled_df, width='stretch', hide_index=True,
              column_config={
                  'Metric': st.column_config.Column(width='content')
              })
 
-@st.cache_data(ttl=3600)
-def fetch_stock_data(ticker, period="1y"):
-    """Fetch stock data with caching to speed up repeated requests"""
-    try:
-        return yf.Ticker(ticker).history(period=period)
-    except Exception as e:
-        logging.error(f"Failed to fetch stock data for {ticker}: {str(e)}")
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_history_chart(ticker):
+    """Build the 1Y close chart once per ticker; returns serialized figure JSON or None"""
+    stock_data = get_history_1y(ticker)
+    if stock_data is None or len(stock_data) == 0:
         return None
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=stock_data.index, y=stock_data["Close"], mode="lines", name="Close Price"))
+    fig.update_layout(
+        title=f'{ticker} - 1Y',
+        template="plotly_dark")
+    return fig.to_json()
 
 
 if use_real_data and ticker:
     try:
         with st.spinner(f'Loading 1-year historical data for {ticker}...'):
-            stock_data = fetch_stock_data(ticker)
+            fig_json = build_history_chart(ticker)
             
-            if stock_data is None or len(stock_data) == 0:
+            if fig_json is None:
                 st.error(f"Unable to fetch historical data for {ticker}")
             else:
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(x=stock_data.index, y=stock_data["Close"], mode="lines", name="Close Price"))
-                fig.update_layout(
-                    title=f'{ticker} - 1Y',
-                    template="plotly_dark")
+                fig = go.Figure(json.loads(fig_json))
                 st.plotly_chart(fig, width='stretch')
     except Exception as e:
         error_msg = str(e)[:150]
@@ -19,93 +19,135 @@ INTERVAL_HOURS = 2
 # If page goes hibernation
 HIBERNATION_KEYWORDS = ["asleep", "hibernating", "wake up", "get this app back up", "zzz", "sleep mode"]
 
+# Either element means the page has rendered enough to tell awake from asleep
+READY_SELECTOR = 'iframe[src*="/~/+/"], button:has-text("wake"), button:has-text("back up")'
+
 def is_hibernation_page(page):
     body_text = page.inner_text("body").lower()
     return any(kw in body_text for kw in HIBERNATION_KEYWORDS)
 
-def keep_app_awake():
+def keep_app_awake(context):
+    """Visit the app once in a fresh page of the shared browser context"""
     now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print(f"[{now}] start to visit: {APP_URL}")
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            channel="chrome",
-            headless=True
-        )
-        context = browser.new_context(
-            viewport={'width': 1280, 'height': 800},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0'
-        )
-        page = context.new_page()
-
-        success = False
-        try:
-            print("Navigating（there might be redircting）...")
-            page.goto(APP_URL, timeout=TIMEOUT_SEC*1_000, wait_until="networkidle")
+    # Not caught here: if the shared browser died, __main__ relaunches it
+    page = context.new_page()
 
-            # Check hibernation
-            if is_hibernation_page(page):
-                print("Hibernation page detected → bring to live again...")
-                try:
-                    wake_button = page.get_by_role("button", name=re.compile("wake up|get.*back up", re.I))
-                    if wake_button.count() > 0:
-                        wake_button.first.click(timeout=15000)
-                        print("Clicked the wake up button!")
-                    else:
-                        print("Button not found, wait for auto wake up...")
-                except:
-                    print("Failed to click the button, continue waiting...")
-                page.wait_for_timeout(TIMEOUT_SEC*1_000)
-            else:
-                print("None hibernation page → already awake.")
+    success = False
+    try:
+        print("Navigating（there might be redircting）...")
+        page.goto(APP_URL, timeout=TIMEOUT_SEC*1_000, wait_until="domcontentloaded")
 
-            # Iframe
-            print("Awaiting Streamlit main iframe to load...")
-            iframe_element = page.wait_for_selector('iframe[src*="/~/+/"]', timeout=IFRAME_TIMEOUT_SEC*1_000)
-            iframe = iframe_element.content_frame()
-            if not iframe:
-                raise Exception("Cannot enter iframe context")
+        # The page is client-rendered: wait until either the app iframe or the wake button exists
+        try:
+            page.wait_for_selector(READY_SELECTOR, timeout=TIMEOUT_SEC*1_000)
+        except PlaywrightTimeoutError:
+            print("Neither app iframe nor wake button appeared, checking page anyway...")
 
-            print("In iframe, waiting for title...")
+        # Check hibernation
+        if is_hibernation_page(page):
+            print("Hibernation page detected → bring to live again...")
             try:
-                iframe.get_by_role(
-                    "heading",
-                    name=EXPECTED_TITLE,
-                    exact=False
-                ).wait_for(
-                    state="visible", timeout=TIMEOUT_SEC*1_000
-                )
-                print(f"Found expected heading: '{EXPECTED_TITLE}'")
-                success = True
-            except PlaywrightTimeoutError:
-                print("Heading locator timeout")
-                iframe_body_text = iframe.inner_text("body").lower()
-                if "naïve option pricer" in iframe_body_text or "naive option pricer" in iframe_body_text:
-                    print("Found expected type in iframe body")
-                    success = True
+                wake_button = page.get_by_role("button", name=re.compile("wake up|get.*back up", re.I))
+                if wake_button.count() > 0:
+                    wake_button.first.click(timeout=15000)
+                    print("Clicked the wake up button!")
                 else:
-                    print("Keywords not found in iframe body → load might have issues")
-                    print(f"First 300 characters in body: {iframe.inner_text('body')[:300]}")
-
-            time.sleep(5)
-
-        except PlaywrightTimeoutError as te:
-            print(f"Timeout: {te}")
-        except Exception as e:
-            print(f"Exception: {type(e).__name__}: {e}")
-        finally:
-            if not success:
-                print("Saving screenshot for debugging...")
-                screenshot_path = f"logs/debug_fail_{int(time.time())}.png"
+                    print("Button not found, wait for auto wake up...")
+            except:
+                print("Failed to click the button, continue waiting...")
+            page.wait_for_timeout(TIMEOUT_SEC*1_000)
+        else:
+            print("None hibernation page → already awake.")
+
+        # Iframe
+        print("Awaiting Streamlit main iframe to load...")
+        iframe_element = page.wait_for_selector('iframe[src*="/~/+/"]', timeout=IFRAME_TIMEOUT_SEC*1_000)
+        iframe = iframe_element.content_frame()
+        if not iframe:
+            raise Exception("Cannot enter iframe context")
+
+        print("In iframe, waiting for title...")
+        try:
+            iframe.get_by_role(
+                "heading",
+                name=EXPECTED_TITLE,
+                exact=False
+            ).wait_for(
+                state="visible", timeout=TIMEOUT_SEC*1_000
+            )
+            print(f"Found expected heading: '{EXPECTED_TITLE}'")
+            success = True
+        except PlaywrightTimeoutError:
+            print("Heading locator timeout")
+            iframe_body_text = iframe.inner_text("body").lower()
+            if "naïve option pricer" in iframe_body_text or "naive option pricer" in iframe_body_text:
+                print("Found expected type in iframe body")
+                success = True
+            else:
+                print("Keywords not found in iframe body → load might have issues")
+                print(f"First 300 characters in body: {iframe.inner_text('body')[:300]}")
+
+    except PlaywrightTimeoutError as te:
+        print(f"Timeout: {te}")
+    except Exception as e:
+        print(f"Exception: {type(e).__name__}: {e}")
+    finally:
+        if not success:
+            print("Saving screenshot for debugging...")
+            screenshot_path = f"logs/debug_fail_{int(time.time())}.png"
+            try:
                 page.screenshot(path=screenshot_path)
-            browser.close()
+            except Exception as e:
+                print(f"Screenshot failed: {type(e).__name__}: {e}")
+        try:
+            page.close()
+        except Exception as e:
+            print(f"Page close failed: {type(e).__name__}: {e}")
 
     return success
 
 
 
+def launch_browser(p):
+    """Launch Chrome plus the context reused by every visit"""
+    browser = p.chromium.launch(
+        channel="chrome",
+        headless=True
+    )
+    context = browser.new_context(
+        viewport={'width': 1280, 'height': 800},
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0'
+    )
+    return browser, context
+
+def close_browser(browser):
+    try:
+        browser.close()
+    except Exception as e:
+        print(f"Browser close failed (already dead?): {type(e).__name__}: {e}")
+
+
+
 if __name__ == "__main__":
-    while True:
-        keep_app_awake()
-        print(f"\nNext Visit is {INTERVAL_HOURS} hours...\n{'='*60}\n")
-        time.sleep(INTERVAL_HOURS * 3600)
\ No newline at end of file
+    # Launch one browser for the lifetime of the script and reuse it for every visit
+    with sync_playwright() as p:
+        browser, context = launch_browser(p)
+        try:
+            while True:
+                try:
+                    keep_app_awake(context)
+                except Exception as e:
+                    # Chrome may have died during the sleep → relaunch and retry this visit once
+                    print(f"Browser unavailable: {type(e).__name__}: {e} → relaunching...")
+                    close_browser(browser)
+                    try:
+                        browser, context = launch_browser(p)
+                        keep_app_awake(context)
+                    except Exception as e:
+                        print(f"Relaunch failed: {type(e).__name__}: {e} → will retry on next visit")
+                print(f"\nNext Visit is {INTERVAL_HOURS} hours...\n{'='*60}\n")
+                time.sleep(INTERVAL_HOURS * 3600)
+        finally:
+            close_browser(browser)
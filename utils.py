@@ -1,16 +1,23 @@
 import math
+import random
 import streamlit as st
-from scipy.stats import norm
 import numpy as np
-import yfinance as yf
 import logging
 import time
-from functools import wraps
+from functools import lru_cache, wraps
 
 
 
 logging.basicConfig(level=logging.INFO)
 
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+
+
+def _ncdf(x):
+    """Standard normal CDF via math.erf (avoids scipy's per-call dispatch)"""
+    return 0.5 * (1.0 + math.erf(x * _INV_SQRT2))
+
 
 
 # Retry decorator - handle rate limiting and temporary errors
@@ -19,12 +26,17 @@ def retry_with_backoff(max_retries=3, backoff_factor=1.5):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            # Deferred to keep cold start light; yfinance 1.x does its HTTP through curl_cffi
+            from curl_cffi.requests.exceptions import RequestException
+            from yfinance.exceptions import YFRateLimitError
+
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
+                except (RequestException, TimeoutError, ConnectionError, YFRateLimitError) as e:
                     if attempt < max_retries - 1:
-                        wait_time = backoff_factor * (2 ** attempt)
+                        # Jitter so concurrent sessions don't retry in lockstep
+                        wait_time = backoff_factor * (2 ** attempt) * (0.5 + random.random())
                         logging.warning(f"Request failed (attempt {attempt + 1}/{max_retries}): {str(e)[:100]}. Retrying in {wait_time:.1f}s...")
                         time.sleep(wait_time)
                     else:
@@ -35,15 +47,102 @@ def retry_with_backoff(max_retries=3, backoff_factor=1.5):
 
 
 
-def black_scholes(S, K, T, r, sigma, option_type="call"):
-    d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-    if option_type == "call":
-        return S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
-    elif option_type == "put":
-        return K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+def black_scholes_pair(S, K, T, r, sigma):
+    """Black-Scholes call and put prices in one pass.
+
+    Inputs are rounded before lookup so float noise from widgets still
+    hits the LRU cache on reruns that don't change the pricing inputs.
+
+    Returns:
+        tuple: (call, put)
+    """
+    return _bs_pair_cached(round(S, 6), round(K, 6), round(T, 10), round(r, 8), round(sigma, 8))
+
+
+@lru_cache(maxsize=256)
+def _bs_pair_cached(S, K, T, r, sigma):
+    """d1/d2 and the discount factor are computed once and shared by both legs.
+
+    The put uses N(-d1)/N(-d2) directly rather than put-call parity, which
+    cancels to tiny negative prices for deep out-of-the-money puts."""
+    sqrtT = math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrtT)
+    d2 = d1 - sigma * sqrtT
+    disc = math.exp(-r * T)
+    call = S * _ncdf(d1) - K * disc * _ncdf(d2)
+    put = K * disc * _ncdf(-d2) - S * _ncdf(-d1)
+    return call, put
+
+
+def _bs_kernel(S, K, T, r, sigma, is_call):
+    """Scalar Black-Scholes price, written loop-style so numba can compile it
+
+    Edge cases are handled explicitly so numba and np.vectorize agree: non-positive
+    S or K gives nan, and T <= 0 or sigma <= 0 gives the (discounted) intrinsic value.
+    """
+    if S <= 0.0 or K <= 0.0:
+        return math.nan
+    if T <= 0.0 or sigma <= 0.0:
+        disc = math.exp(-r * T) if T > 0.0 else 1.0
+        if is_call:
+            return max(S - K * disc, 0.0)
+        else:
+            return max(K * disc - S, 0.0)
+    sqrtT = math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrtT)
+    d2 = d1 - sigma * sqrtT
+    disc = math.exp(-r * T)
+    if is_call:
+        return S * 0.5 * (1.0 + math.erf(d1 * _INV_SQRT2)) - K * disc * 0.5 * (1.0 + math.erf(d2 * _INV_SQRT2))
     else:
-        return None
+        return K * disc * 0.5 * (1.0 + math.erf(-d2 * _INV_SQRT2)) - S * 0.5 * (1.0 + math.erf(-d1 * _INV_SQRT2))
+
+
+@lru_cache(maxsize=None)
+def _get_bs_vec():
+    """Build the batch pricing ufunc on first use.
+
+    Deferred so `import utils` doesn't pay for importing and loading numba on every
+    cold start, since the app itself never calls it. Compiled as a parallel numba
+    ufunc when the `fast` extra is installed; otherwise np.vectorize, which still
+    loops over elements in Python.
+    """
+    try:
+        import numba
+    except ImportError:
+        return np.vectorize(_bs_kernel, otypes=[np.float64])
+    return numba.vectorize(
+        ['float64(float64, float64, float64, float64, float64, boolean)'],
+        target='parallel',
+        cache=True,
+    )(_bs_kernel)
+
+
+def bs_vec(S, K, T, r, sigma, is_call):
+    """Batch Black-Scholes prices; arguments broadcast NumPy-style (see _get_bs_vec)"""
+    return _get_bs_vec()(S, K, T, r, sigma, is_call)
+
+
+def black_scholes_grid(S, K, T, r, sigma, is_call=True):
+    """Black-Scholes prices over a broadcast grid of inputs.
+
+    Any argument may be a scalar or array (e.g. a strike ladder for K and a
+    vol smile for sigma); they are broadcast NumPy-style and priced with bs_vec.
+    That is a compiled ufunc with the `fast` extra (numba), otherwise an
+    np.vectorize loop in Python. Edge cases follow _bs_kernel on both backends.
+
+    Returns:
+        numpy.ndarray: Option prices with the broadcast shape of the inputs
+                       (0-d for all-scalar input)
+    """
+    return np.asarray(bs_vec(
+        np.asarray(S, dtype=np.float64),
+        np.asarray(K, dtype=np.float64),
+        np.asarray(T, dtype=np.float64),
+        np.asarray(r, dtype=np.float64),
+        np.asarray(sigma, dtype=np.float64),
+        np.asarray(is_call, dtype=np.bool_),
+    ), dtype=np.float64)
 
 
 def bs_delta(S, K, T, r, sigma, option_type="call"):
@@ -63,9 +162,9 @@ def bs_delta(S, K, T, r, sigma, option_type="call"):
 
         d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
         if option_type == "call":
-            return float(norm.cdf(d1))
+            return _ncdf(d1)
         else:
-            return float(norm.cdf(d1) - 1.0)
+            return _ncdf(d1) - 1.0
     except Exception:
         # Fallback: return 0.0 to avoid crashing the app
         logging.warning("bs_delta: invalid inputs, returning 0.0")
@@ -73,6 +172,7 @@ def bs_delta(S, K, T, r, sigma, option_type="call"):
     
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
 @retry_with_backoff(max_retries=3, backoff_factor=1.5)
 def calc_hist_vol(ticker, period):
     """Calculate historical volatility with retry mechanism
@@ -87,21 +187,22 @@ def calc_hist_vol(ticker, period):
     Raises:
         ValueError: When unable to fetch or calculate volatility
     """
+    import yfinance as yf
+
     try:
-        # Use progress=False to avoid cluttering output
-        data = yf.download(ticker, period=period, progress=False)['Close']
+        data = yf.Ticker(ticker).history(period=period, auto_adjust=False)['Close']
         
         if data is None or len(data) < 2:
             raise ValueError(f"Unable to fetch valid historical data for {ticker}")
         
-        log_returns = np.log(data / data.shift(1)).dropna()
+        arr = data.to_numpy(dtype=np.float64)
+        # log(p_t / p_{t-1}) == log1p((p_t - p_{t-1}) / p_{t-1}), more accurate for small moves
+        log_returns = np.log1p(np.diff(arr) / arr[:-1])
         
         if len(log_returns) == 0:
             raise ValueError(f"Unable to calculate log returns for {ticker}")
         
-        hist_vol = log_returns.std() * np.sqrt(252)  # Annualize
-        # Convert to scalar if Series
-        hist_vol = hist_vol.iloc[0] if hasattr(hist_vol, 'iloc') else float(hist_vol)
+        hist_vol = float(log_returns.std(ddof=1) * math.sqrt(252))  # Annualize, ddof=1 matches pandas
         
         if hist_vol <= 0 or np.isnan(hist_vol):
             raise ValueError(f"Calculated volatility is invalid: {hist_vol}")
@@ -113,29 +214,93 @@ def calc_hist_vol(ticker, period):
 
 
 
-@st.cache_data(ttl=86400)
+@st.cache_data(ttl=300, show_spinner=False)
 @retry_with_backoff(max_retries=3, backoff_factor=1.5)
+def get_last_price(ticker):
+    """Fetch last traded price via the lightweight fast_info endpoint
+    
+    Args:
+        ticker: Stock ticker symbol
+    
+    Returns:
+        float: Last price, or None if Yahoo Finance returned no valid price
+    """
+    import yfinance as yf
+
+    # Fresh Ticker on purpose: yfinance memoizes fast_info on the Ticker, and the
+    # fetchers run concurrently from app.py, so Tickers are never shared
+    last_price = yf.Ticker(ticker).fast_info.get('lastPrice', None)
+    logging.info(f'{ticker} lastPrice: {last_price}')
+    
+    if last_price is None or not last_price > 0:
+        return None
+    return float(last_price)
+
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_history_1y(ticker):
+    """Fetch 1-year daily close history, cached so reruns skip the network
+    
+    Args:
+        ticker: Stock ticker symbol
+    
+    Returns:
+        pandas.DataFrame: Single 'Close' column indexed by date
+    """
+    import yfinance as yf
+
+    try:
+        return yf.Ticker(ticker).history(period='1y')[['Close']]
+    except Exception as e:
+        logging.error(f"Failed to fetch stock data for {ticker}: {str(e)}")
+        raise
+
+
+
+@st.cache_data(ttl=300, show_spinner=False)
 def get_risk_free_rate():
-    """Fetch risk-free rate with retry mechanism, returns default value on failure
+    """Fetch risk-free rate, remembering failures for 5 minutes
     
-    Uses ^IRX (3-Month Treasury Bill) as a proxy for the risk-free rate
+    A successful value is cached for a day by _fetch_risk_free_rate. A failure is
+    cached here as None for ttl=300, so reruns don't hit Yahoo again meanwhile
+    and no fallback value is cached long-term.
     
     Returns:
-        float: Risk-free rate in decimal form (e.g., 0.05 represents 5%)
+        float: Risk-free rate in decimal form, or None if it could not be fetched
     """
     try:
-        ticker = yf.Ticker('^IRX')
-        time.sleep(0.5)  # Avoid rate limiting, request interval
-        risk_free_rate = ticker.fast_info.get('lastPrice', None)
-        logging.info(f'^IRX data: {risk_free_rate}')
-        
-        if risk_free_rate and risk_free_rate > 0:
-            result = risk_free_rate / 100
-            logging.info(f"Successfully fetched risk-free rate: {result:.4f}")
-            return result
-        else:
-            logging.warning("Unable to fetch ^IRX price, using default risk-free rate 0.02")
-            return 0.02
+        return _fetch_risk_free_rate()
     except Exception as e:
-        logging.error(f"Failed to fetch risk-free rate: {str(e)[:100]}, using default value 0.02")
-        return 0.02
\ No newline at end of file
+        logging.error(f"Failed to fetch risk-free rate: {str(e)[:100]}")
+        return None
+
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+@retry_with_backoff(max_retries=3, backoff_factor=1.5)
+def _fetch_risk_free_rate():
+    """Fetch risk-free rate with retry mechanism
+    
+    Uses ^IRX (3-Month Treasury Bill) as a proxy for the risk-free rate.
+    Network errors propagate so retry_with_backoff can retry them, and failures
+    are raised rather than returned so st.cache_data never caches them for a day.
+    
+    Returns:
+        float: Risk-free rate in decimal form (e.g., 0.05 represents 5%)
+        
+    Raises:
+        ValueError: When Yahoo Finance returns no valid ^IRX price
+    """
+    import yfinance as yf
+
+    # Goes through yfinance's authenticated session; Yahoo's quote endpoints reject bare requests
+    risk_free_rate = yf.Ticker('^IRX').fast_info.get('lastPrice', None)
+    logging.info(f'^IRX data: {risk_free_rate}')
+    
+    if risk_free_rate is None or not risk_free_rate > 0:
+        raise ValueError(f"Invalid ^IRX price: {risk_free_rate}")
+    
+    result = risk_free_rate / 100
+    logging.info(f"Successfully fetched risk-free rate: {result:.4f}")
+    return result